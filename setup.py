@@ -16,12 +16,10 @@
 import os
 import platform
 
-from setuptools import find_packages
+from setuptools import Extension, find_packages, setup
 
 try:
     import numpy as np
-    from numpy.distutils.core import setup
-    from numpy.distutils.extension import Extension
 except ImportError as exc:
     raise ImportError(
         "Numpy must be installed to build The Walrus."
@@ -52,6 +50,9 @@ def build_extensions():
     USE_OPENBLAS = bool(os.environ.get("USE_OPENBLAS"))
     USE_LAPACK = bool(os.environ.get("USE_LAPACK")) or USE_OPENBLAS
     USE_OPENMP = platform.system() != "Windows"
+    USE_NATIVE_ARCH = bool(os.environ.get("USE_NATIVE_ARCH"))
+    PGO = os.environ.get("PGO", "")
+    PGO_PROFILE_DIR = os.path.abspath(os.environ.get("PGO_PROFILE_DIR", "pgo"))
     EIGEN_INCLUDE_DIR = os.environ.get("EIGEN_INCLUDE_DIR", "")
 
     config = {
@@ -75,10 +76,7 @@ def build_extensions():
     }
 
     if platform.system() == "Windows":
-        config["extra_compile_args"].extend(("-static",))
-        config["extra_link_args"].extend(
-            ("-static", "-static-libgfortran", "-static-libgcc")
-        )
+        config["extra_link_args"].extend(("-static", "-static-libgcc"))
     elif platform.system() == "Darwin":
         config["extra_compile_args"].extend(
             ("-Xpreprocessor", "-fopenmp", "-mmacosx-version-min=10.9", "-shared")
@@ -89,8 +87,8 @@ def build_extensions():
             "XcodeDefault.xctoolchain/usr/include/c++/v1/"
         )
     else:
-        config["extra_compile_args"].extend(("-fopenmp", "-shared"))
-        config["extra_link_args"].extend(("-fopenmp",))
+        config["extra_compile_args"].extend(("-fopenmp", "-shared", "-flto"))
+        config["extra_link_args"].extend(("-fopenmp", "-flto"))
 
     if EIGEN_INCLUDE_DIR:
         config["include_dirs"].append(EIGEN_INCLUDE_DIR)
@@ -99,6 +97,20 @@ def build_extensions():
             ("/usr/include/eigen3", "/usr/local/include/eigen3")
         )
 
+    if USE_NATIVE_ARCH:
+        config["extra_compile_args"].append("-march=native")
+
+    if PGO == "generate":
+        pgo_flags = ("-fprofile-generate=" + PGO_PROFILE_DIR,)
+        config["extra_compile_args"].extend(pgo_flags)
+        config["extra_link_args"].extend(pgo_flags)
+    elif PGO == "use":
+        config["extra_compile_args"].extend(
+            ("-fprofile-use=" + PGO_PROFILE_DIR, "-fprofile-correction")
+        )
+    elif PGO:
+        raise ValueError("PGO must be either 'generate' or 'use'.")
+
     if USE_OPENBLAS:
         config["extra_compile_args"].append("-lopenblas")
 
@@ -131,7 +143,6 @@ info = {
         "dask[delayed]",
         "numba>=0.49.1",
         "scipy>=1.2.1",
-        "sympy>=1.5.1",
         "repoze.lru>=0.7",
     ],
     "setup_requires": ["cython", "numpy"],
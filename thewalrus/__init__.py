@@ -103,8 +103,14 @@ from ._hafnian import (
 )
 from ._low_rank_haf import low_rank_hafnian
 from ._hermite_multidimensional import hafnian_batched, hermite_multidimensional
-from ._permanent import perm, perm_complex, perm_real, permanent_repeated
-from ._torontonian import tor, threshold_detection_prob_displacement, threshold_detection_prob, numba_tor
+from ._permanent import perm, perm_bbfg, perm_complex, perm_real, permanent_repeated
+from ._torontonian import (
+    tor,
+    threshold_detection_prob_displacement,
+    threshold_detection_prob,
+    threshold_detection_probs,
+    numba_tor,
+)
 from ._version import __version__
 
 
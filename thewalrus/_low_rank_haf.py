@@ -17,7 +17,7 @@ Algorithms for hafnians of low-rank matrices.
 
 from itertools import product
 import numpy as np
-from sympy import symbols, expand
+import numba
 from scipy.special import factorial2
 from repoze.lru import lru_cache
 
@@ -47,7 +47,153 @@ def partitions(r, n):
     return new_combos
 
 
-def low_rank_hafnian(G):
+@numba.jit(nopython=True, cache=True)
+def double_factorials(n):  # pragma: no cover
+    r"""Returns the table of double factorials :math:`(k-1)!!` for :math:`k = 0, \ldots, n`,
+    with the convention :math:`(-1)!! = 0!! = 1`.
+
+    Args:
+        n (int): largest entry of the table.
+
+    Returns:
+        array: double factorials :math:`(k-1)!!`.
+    """
+    dfact = np.ones(n + 1, dtype=np.float64)
+    for k in range(3, n + 1):
+        dfact[k] = (k - 1) * dfact[k - 2]
+    return dfact
+
+
+@numba.jit(nopython=True, cache=True)
+def _lrh_r2(G):  # pragma: no cover
+    r"""Numba kernel of :func:`low_rank_hafnian` for matrices of rank two.
+
+    The coefficients of :math:`q(x_0, x_1) = \prod_i (g_{i,0} x_0 + g_{i,1} x_1)` are accumulated
+    in a dense array indexed by the powers :math:`(p_0, p_1)`.
+
+    Args:
+        G (array): complex array of size :math:`n \times 2`, whose data type is used
+            for the coefficients.
+
+    Returns:
+        complex: hafnian of G @ G.T.
+    """
+    n = G.shape[0]
+    coef = np.zeros((n + 1, n + 1), dtype=G.dtype)
+    coef[0, 0] = 1.0
+    for i in range(n):
+        # coefficients of degree i + 1 only depend on those of degree i,
+        # thus the update can be done in place
+        for p0 in range(i + 2):
+            p1 = i + 1 - p0
+            coef[p0, p1] = 0
+            if p0 > 0:
+                coef[p0, p1] += G[i, 0] * coef[p0 - 1, p1]
+            if p1 > 0:
+                coef[p0, p1] += G[i, 1] * coef[p0, p1 - 1]
+
+    dfact = double_factorials(n)
+    haf = 0.0j
+    for p0 in range(0, n + 1, 2):
+        haf += coef[p0, n - p0] * dfact[p0] * dfact[n - p0]
+    return haf
+
+
+@numba.jit(nopython=True, cache=True)
+def _lrh_r3(G):  # pragma: no cover
+    r"""Numba kernel of :func:`low_rank_hafnian` for matrices of rank three.
+
+    The coefficients of :math:`q(x_0, x_1, x_2) = \prod_i (g_{i,0} x_0 + g_{i,1} x_1 + g_{i,2} x_2)`
+    are accumulated in a dense array indexed by the powers :math:`(p_0, p_1, p_2)`.
+
+    Args:
+        G (array): complex array of size :math:`n \times 3`, whose data type is used
+            for the coefficients.
+
+    Returns:
+        complex: hafnian of G @ G.T.
+    """
+    n = G.shape[0]
+    coef = np.zeros((n + 1, n + 1, n + 1), dtype=G.dtype)
+    coef[0, 0, 0] = 1.0
+    for i in range(n):
+        for p0 in range(i + 2):
+            for p1 in range(i + 2 - p0):
+                p2 = i + 1 - p0 - p1
+                coef[p0, p1, p2] = 0
+                if p0 > 0:
+                    coef[p0, p1, p2] += G[i, 0] * coef[p0 - 1, p1, p2]
+                if p1 > 0:
+                    coef[p0, p1, p2] += G[i, 1] * coef[p0, p1 - 1, p2]
+                if p2 > 0:
+                    coef[p0, p1, p2] += G[i, 2] * coef[p0, p1, p2 - 1]
+
+    dfact = double_factorials(n)
+    haf = 0.0j
+    for p0 in range(0, n + 1, 2):
+        for p1 in range(0, n + 1 - p0, 2):
+            p2 = n - p0 - p1
+            haf += coef[p0, p1, p2] * dfact[p0] * dfact[p1] * dfact[p2]
+    return haf
+
+
+@numba.jit(nopython=True, cache=True)
+def _lrh_numba(G):  # pragma: no cover
+    r"""Numba kernel of :func:`low_rank_hafnian` for matrices of arbitrary rank.
+
+    The coefficients of :math:`q(x_0, \ldots, x_{r-1}) = \prod_i \sum_j g_{i,j} x_j` are
+    accumulated in a dense flattened array of size :math:`(n+1)^r`.
+
+    Args:
+        G (array): complex array of size :math:`n \times r`, whose data type is used
+            for the coefficients.
+
+    Returns:
+        complex: hafnian of G @ G.T.
+    """
+    n, r = G.shape
+    strides = np.empty(r, dtype=np.int64)
+    strides[r - 1] = 1
+    for j in range(r - 2, -1, -1):
+        strides[j] = (n + 1) * strides[j + 1]
+    size = (n + 1) * strides[0]
+
+    powers = np.empty(r, dtype=np.int64)
+    coef = np.zeros(size, dtype=G.dtype)
+    coef[0] = 1.0
+    for i in range(n):
+        # coefficients of degree i + 1 only depend on those of degree i,
+        # thus the update can be done in place
+        for idx in range(size):
+            degree = 0
+            for j in range(r):
+                powers[j] = (idx // strides[j]) % (n + 1)
+                degree += powers[j]
+            if degree != i + 1:
+                continue
+            coef[idx] = 0
+            for j in range(r):
+                if powers[j] > 0:
+                    coef[idx] += G[i, j] * coef[idx - strides[j]]
+
+    dfact = double_factorials(n)
+    haf = 0.0j
+    for idx in range(size):
+        degree = 0
+        fact = 1.0
+        for j in range(r):
+            p = (idx // strides[j]) % (n + 1)
+            degree += p
+            if p % 2 == 1:
+                fact = 0.0
+            else:
+                fact *= dfact[p]
+        if degree == n and fact != 0.0:
+            haf += coef[idx] * fact
+    return haf
+
+
+def low_rank_hafnian(G, dtype=np.complex128):
     r"""Returns the hafnian of the low rank matrix :math:`\bm{A} = \bm{G} \bm{G}^T` where :math:`\bm{G}` is rectangular of size
     :math:`n \times r`  with :math:`r \leq n`.
 
@@ -55,34 +201,31 @@ def low_rank_hafnian(G):
 
     The hafnian is calculated using the algorithm described in Appendix C of
     *A faster hafnian formula for complex matrices and its benchmarking on a supercomputer*,
-    :cite:`bjorklund2018faster`.
+    :cite:`bjorklund2018faster`. The coefficients of the polynomial
+    :math:`q(x_1, \ldots, x_r) = \prod_i \sum_j g_{i,j} x_j` are stored in a dense array
+    and accumulated factor by factor within a Numba kernel.
 
     Args:
         G (array): factorization of the low rank matrix A = G @ G.T.
+        dtype (type): data type of the polynomial coefficients, either ``np.complex128``
+            or ``np.complex64``. Single precision halves the memory used by the coefficients,
+            at the cost of accuracy and of a smaller range before they overflow.
 
     Returns:
         (complex): hafnian of A.
     """
+    if dtype not in (np.complex128, np.complex64):
+        raise ValueError("dtype must be either np.complex128 or np.complex64.")
+
     n, r = G.shape
     if n % 2 != 0:
         return 0
+
+    G = np.asarray(G, dtype=dtype)
     if r == 1:
         return factorial2(n - 1) * np.prod(G)
-    poly = 1
-    x = symbols("x0:" + str(r))
-    for k in range(n):
-        term = 0
-        for j in range(r):
-            term += G[k, j] * x[j]
-        poly = expand(poly * term)
-
-    comb = partitions(r, n // 2)
-    haf_val = 0.0
-    for c in comb:
-        monomial = 1
-        facts = 1
-        for i, pi in enumerate(c):
-            monomial *= x[i] ** (2 * pi)
-            facts = facts * factorial2(2 * pi - 1)
-        haf_val += complex(poly.coeff(monomial) * facts)
-    return haf_val
+    if r == 2:
+        return _lrh_r2(G)
+    if r == 3:
+        return _lrh_r3(G)
+    return _lrh_numba(G)
@@ -15,17 +15,19 @@
 Permanent Python interface
 """
 import numpy as np
+import numba
 
 from ._hafnian import hafnian_repeated
 from .libwalrus import perm_complex, perm_real
 
 
-def perm(A, quad=True, fsum=False):
+def perm(A, quad=True, fsum=False, method="ryser"):
     """Returns the permanent of a matrix via the
-    `Ryser formula <https://en.wikipedia.org/wiki/Computing_the_permanent#Ryser_formula>`_.
+    `Ryser formula <https://en.wikipedia.org/wiki/Computing_the_permanent#Ryser_formula>`_
+    or the Balasubramanian-Bax-Franklin-Glynn formula.
 
-    For more direct control, you may wish to call :func:`perm_real`
-    or :func:`perm_complex` directly.
+    For more direct control, you may wish to call :func:`perm_real`,
+    :func:`perm_complex` or :func:`perm_bbfg` directly.
 
     Args:
         A (array): a square array.
@@ -34,6 +36,10 @@ def perm(A, quad=True, fsum=False):
         fsum (bool): Whether to use the ``fsum`` method for higher accuracy summation.
             Note that if ``fsum`` is true, double precision will be used, and the
             ``quad`` keyword argument will be ignored.
+        method (str): ``"ryser"`` calls the compiled Ryser implementation of ``libwalrus``,
+            while ``"bbfg"`` calls the Numba implementation of the
+            Balasubramanian-Bax-Franklin-Glynn formula, in which case ``quad`` and ``fsum``
+            are ignored.
 
     Returns:
         np.float64 or np.complex128: the permanent of matrix A.
@@ -50,6 +56,9 @@ def perm(A, quad=True, fsum=False):
     if np.isnan(A).any():
         raise ValueError("Input matrix must not contain NaNs.")
 
+    if method not in ("ryser", "bbfg"):
+        raise ValueError("Method must be either 'ryser' or 'bbfg'.")
+
     if matshape[0] == 2:
         return A[0, 0] * A[1, 1] + A[0, 1] * A[1, 0]
 
@@ -63,14 +72,75 @@ def perm(A, quad=True, fsum=False):
             + A[0, 0] * A[1, 1] * A[2, 2]
         )
 
+    if method == "bbfg":
+        if np.any(np.iscomplex(A)):
+            return perm_bbfg(A.astype(np.complex128))
+        return perm_bbfg(A.real.astype(np.float64))
+
     if A.dtype == np.complex:
         if np.any(np.iscomplex(A)):
             return perm_complex(A, quad=quad)
-        return perm_real(np.float64(A.real), quad=quad, fsum=fsum)
+        return perm_real(A.real.astype(np.float64), quad=quad, fsum=fsum)
 
     return perm_real(A, quad=quad, fsum=fsum)
 
 
+@numba.jit(nopython=True, parallel=True, cache=True)
+def perm_bbfg(M):  # pragma: no cover
+    r"""Returns the permanent of a matrix using the Balasubramanian-Bax-Franklin-Glynn formula
+
+    .. math:: \text{perm}(M) = \frac{1}{2^{n-1}} \sum_{\delta} \left(\prod_{k} \delta_k\right)
+        \prod_{j} \sum_{i} \delta_i M_{i,j},
+
+    where :math:`\delta \in \{\pm 1\}^n` with :math:`\delta_{n-1} = 1`. The sign vectors are
+    visited in Gray code order, so that each term follows from the previous one by
+    flipping the sign of a single row. The Gray code sequence is split into chunks
+    that are summed in parallel.
+
+    Args:
+        M (array): a square, ``np.float64`` or ``np.complex128`` array.
+
+    Returns:
+        np.float64 or np.complex128: the permanent of matrix M.
+    """
+    n = len(M)
+    if n == 0:
+        return M.dtype.type(1.0)
+
+    num_terms = 2 ** (n - 1)
+    chunk_size = 2 ** 12
+    n_chunks = -(-num_terms // chunk_size)
+    partial_sums = np.zeros(n_chunks, dtype=M.dtype)
+    for c in numba.prange(n_chunks):
+        start = c * chunk_size
+        end = min(num_terms, start + chunk_size)
+        # row combination for the sign vector of the first Gray code of the chunk
+        gray = start ^ (start >> 1)
+        row_comb = np.zeros(n, dtype=M.dtype)
+        for i in range(n):
+            delta = -1.0 if (gray >> i) & 1 else 1.0
+            for j in range(n):
+                row_comb[j] += delta * M[i, j]
+        # the parity of the Gray code of k is the parity of k
+        sign = -1.0 if start & 1 else 1.0
+        for k in range(start, end):
+            term = row_comb[0]
+            for j in range(1, n):
+                term *= row_comb[j]
+            partial_sums[c] += sign * term
+            sign = -sign
+            # the Gray codes of k and k + 1 differ in the lowest set bit of k + 1
+            i = 0
+            while not ((k + 1) >> i) & 1:
+                i += 1
+            delta = 2.0 if gray & (1 << i) else -2.0
+            gray ^= 1 << i
+            for j in range(n):
+                row_comb[j] += delta * M[i, j]
+
+    return np.sum(partial_sums) / num_terms
+
+
 def permanent_repeated(A, rpt):
     r"""Calculates the permanent of matrix :math:`A`, where the ith row/column
     of :math:`A` is repeated :math:`rpt_i` times.
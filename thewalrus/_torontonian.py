@@ -58,59 +58,65 @@ def tor(A, fsum=False):
     return tor_real(A, fsum=fsum)
 
 
-@numba.jit(nopython=True)
-def combinations(pool, r): # pragma: no cover
-    """Numba implementation of `itertools.combinations`.
-    As itertools.combinations not callable from numba decorated functions.
-
-    Taken from: https://stackoverflow.com/a/61393666
+@numba.jit(nopython=True, cache=True)
+def fill_subset_indices(mask, n, idx): # pragma: no cover
+    """Writes the indices of the modes selected by the bits of ``mask``,
+    followed by the same indices shifted by ``n``, into ``idx``.
 
     Args:
-        pool (Sequence): sequence to take combinations from
-
-        r (int) : number of elements of combination
-    Yields:
-        results (list) : length r combination from pool
+        mask (int) : bitmask whose set bits select a subset of the ``n`` modes
+        n (int) : number of modes
+        idx (array) : integer array of length at least ``2n`` to be filled
+    Return:
+        int : number of indices written, i.e. twice the size of the subset
     """
-    n = len(pool)
-    indices = list(range(r))
-    empty = not (n and (0 < r <= n))
-
-    if not empty:
-        result = [pool[i] for i in indices]
-        yield result
-
-    while not empty:
-        i = r - 1
-        while i >= 0 and indices[i] == i + n - r:
-            i -= 1
-        if i < 0:
-            empty = True
-        else:
-            indices[i] += 1
-            for j in range(i + 1, r):
-                indices[j] = indices[j - 1] + 1
+    m = 0
+    for j in range(n):
+        m += (mask >> j) & 1
+    a = 0
+    for j in range(n):
+        if (mask >> j) & 1:
+            idx[a] = j
+            idx[a + m] = j + n
+            a += 1
+    return 2 * m
+
+
+@numba.jit(nopython=True, cache=True)
+def subset_indices(mask, n): # pragma: no cover
+    """Returns the indices of the modes selected by the bits of ``mask``,
+    followed by the same indices shifted by ``n``.
 
-            result = [pool[i] for i in indices]
-            yield result
+    Args:
+        mask (int) : bitmask whose set bits select a subset of the ``n`` modes
+        n (int) : number of modes
+    Return:
+        array : indices of the subset of rows/columns of a ``2n x 2n`` matrix
+    """
+    idx = np.empty(2 * n, dtype=np.int64)
+    return idx[: fill_subset_indices(mask, n, idx)]
 
 
-@numba.jit(nopython=True)
-def powerset(parent_set): # pragma: no cover
-    """Generates the powerset, the set of all the subsets, of its input. Does not include the empty set.
+@numba.jit(nopython=True, cache=True)
+def fill_submatrix(M, idx, m, out): # pragma: no cover
+    """Copies the submatrix of ``M`` with rows and columns ``idx[:m]`` into
+    the leading ``m x m`` block of ``out``.
 
     Args:
-        parent_set (Sequence) : sequence to take powerset from
+        M (array) : matrix to take submatrix of
+        idx (array) : rows/columns to be selected in submatrix
+        m (int) : number of rows/columns to be selected
+        out (array) : preallocated matrix of size at least ``m x m``
     Return:
-        subset (tuple) : subset of parent_set
+        array : view of the leading ``m x m`` block of ``out``
     """
-    n = len(parent_set)
-    for i in range(n + 1):
-        for subset in combinations(parent_set, i):
-            yield subset
+    for a in range(m):
+        for b in range(m):
+            out[a, b] = M[idx[a], idx[b]]
+    return out[:m, :m]
 
 
-@numba.jit(nopython=True)
+@numba.jit(nopython=True, cache=True)
 def nb_block(X): # pragma: no cover
     """Numba implementation of `np.block`.
     Only suitable for 2x2 blocks.
@@ -127,7 +133,7 @@ def nb_block(X): # pragma: no cover
     return np.concatenate((xtmp1, xtmp2), axis=0)
 
 
-@numba.jit(nopython=True)
+@numba.jit(nopython=True, cache=True)
 def numba_ix(arr, rows, cols): # pragma: no cover
     """Numba implementation of `np.ix_`.
     Required due to numba lacking support for advanced numpy indexing.
@@ -144,7 +150,38 @@ def numba_ix(arr, rows, cols): # pragma: no cover
     return arr[rows][:, cols]
 
 
-@numba.jit(nopython=True)
+@numba.jit(nopython=True, cache=True)
+def sqrt_det_cholesky(M): # pragma: no cover
+    """Returns the square root of the determinant of a Hermitian positive definite matrix
+    as the product of the diagonal of its Cholesky factor.
+
+    Only the lower triangle of ``M`` is read, and it is overwritten by the Cholesky factor.
+
+    Args:
+        M (array) : Hermitian matrix
+    Return:
+        float : square root of the determinant of M, or ``-1`` if M is not positive definite
+    """
+    m = len(M)
+    sqrt_det = 1.0
+    for k in range(m):
+        pivot = M[k, k].real
+        for j in range(k):
+            pivot -= abs(M[k, j]) ** 2
+        if pivot <= 0:
+            return -1.0
+        lkk = np.sqrt(pivot)
+        M[k, k] = lkk
+        for i in range(k + 1, m):
+            val = M[i, k]
+            for j in range(k):
+                val -= M[i, j] * np.conj(M[k, j])
+            M[i, k] = val / lkk
+        sqrt_det *= lkk
+    return sqrt_det
+
+
+@numba.jit(nopython=True, cache=True)
 def Qmat_numba(cov, hbar=2): # pragma: no cover
     r"""Numba compatible version of `thewalrus.quantum.Qmat`
 
@@ -173,33 +210,21 @@ def Qmat_numba(cov, hbar=2): # pragma: no cover
     return Q
 
 
-@numba.jit(nopython=True)
-def threshold_detection_prob_displacement(mu, cov, det_pattern, hbar=2): # pragma: no cover
-    r"""Threshold detection probabilities for Gaussian states with displacement.
+@numba.jit(nopython=True, parallel=True, cache=True)
+def threshold_detection_prob_Q(Q, avec, det_pattern): # pragma: no cover
+    r"""Threshold detection probabilities for Gaussian states with displacement,
+    given the Husimi matrix and the complex displacement vector of the state.
     Formula from Jake Bulmer and Stefano Paesani.
 
-
     Args:
-        mu (1d array) : means of xp Gaussian Wigner function
-        cov (2d array) : : xp Wigner covariance matrix
+        Q (2d array) : :math:`Q` Husimi matrix of the Gaussian state
+        avec (1d array) : complex displacement vector :math:`(\alpha, \alpha^*)` of the state
         det_pattern (1d numpy array) : array of {0,1} to describe the threshold detection outcome
-        hbar (float): the value of :math:`\hbar` in the commutation relation :math:`[\x,\p]=i\hbar`.
 
     Returns:
         np.float64 : probability of detection pattern
     """
-    det_pattern = np.asarray(det_pattern).astype(np.int8)
-
-    m = len(cov)
-    assert cov.shape == (m, m)
-    assert m % 2 == 0
-    n = m // 2
-
-    means_x = mu[:n]
-    means_p = mu[n:]
-    avec = np.concatenate((means_x + 1j * means_p, means_x - 1j * means_p), axis=0) / np.sqrt(2 * hbar)
-
-    Q = Qmat_numba(cov, hbar=hbar)
+    n = len(Q) // 2
 
     if max(det_pattern) > 1:
         raise ValueError(
@@ -228,10 +253,9 @@ def threshold_detection_prob_displacement(mu, cov, det_pattern, hbar=2): # pragm
     p0a = p0a_fact_exp / p0a_fact_det
 
     n_det = len(nonzero_idxs)
-    p_sum = 1.  # empty set is not included in the powerset function so we start at 1
-    for z in powerset(np.arange(n_det)):
-        Z = np.asarray(z)
-        ZZ = np.concatenate((Z, Z + n_det), axis=0)
+    p_sum = 1.  # the empty set contributes 1, so the loop starts at the first nonempty subset
+    for k in numba.prange(1, 2 ** n_det):
+        ZZ = subset_indices(k, n_det)
 
         avec0 = avec_cond[ZZ]
         Q0 = numba_ix(Qcond, ZZ, ZZ)
@@ -240,14 +264,65 @@ def threshold_detection_prob_displacement(mu, cov, det_pattern, hbar=2): # pragm
         fact_exp = np.exp(avec0 @ Q0inv @ avec0.conj() * (-0.5)).real
         fact_det = np.sqrt(np.linalg.det(Q0).real)
 
-        p_sum += ((-1) ** len(Z)) * fact_exp / fact_det
+        # the subset has len(ZZ) // 2 modes, so its sign is given by bit 1 of len(ZZ)
+        sign = -1.0 if len(ZZ) & 2 else 1.0
+        p_sum += sign * fact_exp / fact_det
 
     return p0a * p_sum
 
+
+def threshold_detection_probs_displacement(mu, cov, det_patterns, hbar=2):
+    r"""Threshold detection probabilities of several detection patterns for Gaussian states
+    with displacement. The Husimi matrix and the displacement vector of the state are
+    calculated once and shared by all the patterns.
+
+    Args:
+        mu (1d array) : means of xp Gaussian Wigner function
+        cov (2d array) : : xp Wigner covariance matrix
+        det_patterns (2d array) : array of {0,1} whose rows describe threshold detection outcomes
+        hbar (float): the value of :math:`\hbar` in the commutation relation :math:`[\x,\p]=i\hbar`.
+
+    Returns:
+        array : probabilities of the detection patterns
+    """
+    det_patterns = np.asarray(det_patterns).astype(np.int8)
+
+    m = len(cov)
+    assert cov.shape == (m, m)
+    assert m % 2 == 0
+    n = m // 2
+
+    means_x = mu[:n]
+    means_p = mu[n:]
+    avec = np.concatenate((means_x + 1j * means_p, means_x - 1j * means_p), axis=0) / np.sqrt(2 * hbar)
+
+    Q = Qmat_numba(cov, hbar=hbar)
+
+    # threshold_detection_prob_Q is parallelized, and is called from Python rather than from
+    # another jitted function since Numba cannot reliably load such callers from its cache
+    return np.array([threshold_detection_prob_Q(Q, avec, det_pattern) for det_pattern in det_patterns])
+
+
+def threshold_detection_prob_displacement(mu, cov, det_pattern, hbar=2):
+    r"""Threshold detection probabilities for Gaussian states with displacement.
+    Formula from Jake Bulmer and Stefano Paesani.
+
+
+    Args:
+        mu (1d array) : means of xp Gaussian Wigner function
+        cov (2d array) : : xp Wigner covariance matrix
+        det_pattern (1d numpy array) : array of {0,1} to describe the threshold detection outcome
+        hbar (float): the value of :math:`\hbar` in the commutation relation :math:`[\x,\p]=i\hbar`.
+
+    Returns:
+        np.float64 : probability of detection pattern
+    """
+    return threshold_detection_probs_displacement(mu, cov, [det_pattern], hbar)[0]
+
 def threshold_detection_prob(mu, cov, det_pattern, hbar=2, atol=1e-10, rtol=1e-10): # pylint: disable=too-many-arguments
     r"""Threshold detection probabilities for Gaussian states.
     Formula from Jake Bulmer and Stefano Paesani.
-    When state is displaced, threshold_detection_prob_displacement is called.
+    When state is displaced, threshold_detection_probs_displacement is called.
     Otherwise, tor is called.
 
     Args:
@@ -261,19 +336,40 @@ def threshold_detection_prob(mu, cov, det_pattern, hbar=2, atol=1e-10, rtol=1e-1
     Returns:
         np.float64 : probability of detection pattern
     """
+    return threshold_detection_probs(mu, cov, [det_pattern], hbar=hbar, atol=atol, rtol=rtol)[0]
 
+def threshold_detection_probs(mu, cov, det_patterns, hbar=2, atol=1e-10, rtol=1e-10): # pylint: disable=too-many-arguments
+    r"""Threshold detection probabilities of several detection patterns for Gaussian states.
+    The quantities that depend only on the state are calculated once and shared by all the patterns.
+    When state is displaced, threshold_detection_probs_displacement is called.
+    Otherwise, tor is called for each pattern.
+
+    Args:
+        mu (1d array) : means of xp Gaussian Wigner function
+        cov (2d array) : : xp Wigner covariance matrix
+        det_patterns (2d array) : array of {0,1} whose rows describe threshold detection outcomes
+        hbar (float): the value of :math:`\hbar` in the commutation relation :math:`[\x,\p]=i\hbar`.
+        rtol (float): the relative tolerance parameter used in `np.allclose`
+        atol (float): the absolute tolerance parameter used in `np.allclose`
+
+    Returns:
+        array : probabilities of the detection patterns
+    """
+    det_patterns = np.asarray(det_patterns)
     if np.allclose(mu, 0, atol=atol, rtol=rtol):
         # no displacement
         n_modes = cov.shape[0] // 2
         Q = Qmat(cov, hbar)
         O = Xmat(n_modes) @ Amat(cov, hbar=hbar)
-        rpt2 = np.concatenate((det_pattern, det_pattern))
-        Os = reduction(O, rpt2)
-        return tor(Os) / np.sqrt(np.linalg.det(Q))
-    det_pattern = np.asarray(det_pattern).astype(np.int8)
-    return threshold_detection_prob_displacement(mu, cov, det_pattern, hbar)
-
-@numba.jit(nopython=True)
+        sqrt_det_Q = np.sqrt(np.linalg.det(Q))
+        tors = [
+            tor(reduction(O, np.concatenate((det_pattern, det_pattern))))
+            for det_pattern in det_patterns
+        ]
+        return np.array(tors) / sqrt_det_Q
+    return threshold_detection_probs_displacement(mu, cov, det_patterns.astype(np.int8), hbar)
+
+@numba.jit(nopython=True, parallel=True, cache=True)
 def numba_tor(A): # pragma: no cover
     """Returns the Torontonian of a matrix using numba.
 
@@ -290,12 +386,32 @@ def numba_tor(A): # pragma: no cover
         np.float64 or np.complex128: the torontonian of matrix A.
     """
     n_det = A.shape[0] // 2
-    p_sum = 1.  # empty set is not included in the powerset function so we start at 1
-    for z in powerset(np.arange(n_det)):
-        Z = np.asarray(z)
-        ZZ = np.concatenate((Z, Z + n_det), axis=0)
-        A_ZZ = numba_ix(A, ZZ, ZZ)
-        n = len(Z)
-        p_sum += ((-1) ** n) / np.sqrt(np.linalg.det(np.eye(2*n) - A_ZZ))
-
-    return p_sum * (-1) ** (n_det)
+    I_minus_A = np.eye(2 * n_det) - A
+    # the principal submatrices of a Hermitian matrix are Hermitian, and their
+    # determinants can then be obtained from a Cholesky decomposition
+    hermitian = n_det > 0 and np.max(np.abs(I_minus_A - I_minus_A.conj().T)) < 1e-10
+    n_sub = 2 ** n_det
+    # the subsets are split in chunks, so that the scratch space for the
+    # submatrices is allocated once per chunk rather than once per subset
+    chunk_size = 64
+    n_chunks = -(-n_sub // chunk_size)
+    partial_sums = np.zeros(n_chunks, dtype=I_minus_A.dtype)
+    for c in numba.prange(n_chunks):
+        idx = np.empty(2 * n_det, dtype=np.int64)
+        work = np.empty((2 * n_det, 2 * n_det), dtype=I_minus_A.dtype)
+        # the empty set contributes 1, which is added to the sum at the end
+        for k in range(max(1, c * chunk_size), min(n_sub, (c + 1) * chunk_size)):
+            m = fill_subset_indices(k, n_det, idx)
+            # the subset has m // 2 modes, so its sign is given by bit 1 of m
+            sign = -1.0 if m & 2 else 1.0
+            sqrt_det = -1.0
+            if hermitian:
+                sqrt_det = sqrt_det_cholesky(fill_submatrix(I_minus_A, idx, m, work))
+            if sqrt_det > 0:
+                partial_sums[c] += sign / sqrt_det
+            else:
+                det = np.linalg.det(fill_submatrix(I_minus_A, idx, m, work))
+                partial_sums[c] += sign / np.sqrt(det)
+    p_sum = 1. + np.sum(partial_sums)
+
+    return p_sum if n_det % 2 == 0 else -p_sum
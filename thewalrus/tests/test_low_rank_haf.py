@@ -17,7 +17,12 @@ import pytest
 import numpy as np
 from thewalrus import low_rank_hafnian, hafnian
 from thewalrus._low_rank_haf import partitions
-from scipy.special import binom
+from scipy.special import binom, factorial2
+
+RNG = np.random.RandomState(137)
+MATRICES = {
+    (n, r): RNG.rand(n, r) + 1j * RNG.rand(n, r) for n in range(8, 14) for r in range(1, 5)
+}
 
 
 @pytest.mark.parametrize("n", [9, 11, 13])
@@ -41,17 +46,62 @@ def test_partitions_correctness(n, r):
 @pytest.mark.parametrize("r", [1, 2, 3])
 def test_odd_n(n, r):
     """Test that if n is odd one gets zero"""
-    G = np.random.rand(n, r) + 1j * np.random.rand(n, r)
+    G = MATRICES[(n, r)]
     haf = low_rank_hafnian(G)
     assert np.allclose(haf, 0)
 
 
 @pytest.mark.parametrize("n", [8, 10, 12])
-@pytest.mark.parametrize("r", [1, 2, 3])
+@pytest.mark.parametrize("r", [1, 2, 3, 4])
 def test_rank_r(r, n):
     """Test rank-r matrices"""
-    G = np.random.rand(n, r) + 1j * np.random.rand(n, r)
+    G = MATRICES[(n, r)]
     A = G @ G.T
     haf = low_rank_hafnian(G)
     expected = hafnian(A)
     assert np.allclose(haf, expected)
+
+
+@pytest.mark.parametrize("n", [8, 10, 12])
+def test_rank_one_constant(n):
+    """Test the rank-one matrix with all entries equal to c**2, whose hafnian is
+    the number of perfect matchings (n-1)!! times c**n"""
+    c = np.random.rand() + 1j * np.random.rand()
+    G = c * np.ones([n, 1])
+    haf = low_rank_hafnian(G)
+    expected = factorial2(n - 1) * c ** n
+    assert np.allclose(haf, expected)
+
+
+@pytest.mark.parametrize("sizes", [[2, 6], [4, 4], [2, 2, 8], [4, 6, 2], [2, 4, 2, 4]])
+def test_block_diagonal(sizes):
+    """Test rank-r matrices made of r constant diagonal blocks of even sizes, whose hafnian
+    is the product of the hafnians of the blocks"""
+    r = len(sizes)
+    c = np.random.rand(r) + 1j * np.random.rand(r)
+    G = np.zeros([sum(sizes), r], dtype=np.complex128)
+    start = 0
+    for j, size in enumerate(sizes):
+        G[start : start + size, j] = c[j]
+        start += size
+    haf = low_rank_hafnian(G)
+    expected = np.prod([factorial2(size - 1) * c[j] ** size for j, size in enumerate(sizes)])
+    assert np.allclose(haf, expected)
+
+
+@pytest.mark.parametrize("n", [8, 10, 12])
+@pytest.mark.parametrize("r", [1, 2, 3, 4])
+def test_rank_r_complex64(r, n):
+    """Test rank-r matrices using single precision coefficients"""
+    G = MATRICES[(n, r)]
+    A = G @ G.T
+    haf = low_rank_hafnian(G, dtype=np.complex64)
+    expected = hafnian(A)
+    assert np.allclose(haf, expected, rtol=1e-4)
+
+
+def test_dtype_exception():
+    """Test that an exception is raised for an unsupported dtype"""
+    G = np.ones([4, 2])
+    with pytest.raises(ValueError):
+        low_rank_hafnian(G, dtype=np.float64)
@@ -18,7 +18,7 @@ import pytest
 import numpy as np
 from scipy.special import factorial as fac
 
-from thewalrus import perm, perm_real, perm_complex, permanent_repeated
+from thewalrus import perm, perm_real, perm_complex, perm_bbfg, permanent_repeated
 
 
 class TestPermanentWrapper:
@@ -97,6 +97,34 @@ class TestPermanentWrapper:
         assert np.allclose(p, expected)
 
 
+    def test_method_exception(self):
+        """Check exception for an unknown method"""
+        for n in (2, 3, 4):
+            A = np.ones([n, n])
+            with pytest.raises(ValueError):
+                perm(A, method="foo")
+
+    @pytest.mark.parametrize("n", [1, 4, 7, 10])
+    def test_bbfg(self, random_matrix, n):
+        """Check perm(A, method="bbfg") agrees with the Ryser permanent"""
+        A = random_matrix(n)
+        p = perm(A, method="bbfg")
+        expected = perm(A.astype(np.complex128))
+        assert np.allclose(p, expected)
+
+    def test_bbfg_empty(self, random_matrix):
+        """Check perm(A, method="bbfg") of the empty matrix is 1"""
+        A = random_matrix(0)
+        assert np.allclose(perm(A, method="bbfg"), 1)
+
+    @pytest.mark.parametrize("n", [1, 5, 14])
+    def test_bbfg_ones(self, n):
+        """Check the all ones matrix has perm_bbfg(J_n)=n!, including
+        matrices whose Gray code sequence is split in several chunks"""
+        A = np.ones([n, n])
+        assert np.allclose(perm_bbfg(A), fac(n))
+
+
 class TestPermanentRepeated:
     """Tests for the repeated permanent"""
 
@@ -13,13 +13,22 @@
 # limitations under the License.
 """Tests for the Torontonian"""
 # pylint: disable=no-self-use,redefined-outer-name
+import itertools
+from functools import lru_cache
+
 import pytest
 
 import numpy as np
 from scipy.special import poch, factorial
 from thewalrus.quantum import density_matrix_element, reduced_gaussian, Qmat, Xmat, Amat
 from thewalrus.random import random_covariance
-from thewalrus import tor, threshold_detection_prob_displacement, threshold_detection_prob, numba_tor
+from thewalrus import (
+    tor,
+    threshold_detection_prob_displacement,
+    threshold_detection_prob,
+    threshold_detection_probs,
+    numba_tor,
+)
 from thewalrus.symplectic import two_mode_squeezing
 
 def gen_omats(l, nbar):
@@ -35,8 +44,10 @@ def gen_omats(l, nbar):
     Returns:
         array: An O matrix whose Torontonian can be calculated analytically.
     """
-    A = (nbar / (l * (1.0 + nbar))) * np.ones([l, l])
-    O = np.block([[A, 0 * A], [0 * A, A]])
+    O = np.zeros([2 * l, 2 * l])
+    val = nbar / (l * (1.0 + nbar))
+    O[:l, :l] = val
+    O[l:, l:] = val
     return O
 
 
@@ -45,18 +56,36 @@ def torontonian_analytical(l, nbar):
 
     Args:
         l (int): number of modes
-        nbar (float): mean photon number of the first mode (the only one not prepared in vacuum)
+        nbar (float or array): mean photon number of the first mode (the only one not prepared in vacuum)
 
     Returns:
-        float: Value of the torontonian of gen_omats(l,nbar)
+        float or array: Value of the torontonian of gen_omats(l,nbar)
     """
-    if np.allclose(l, nbar, atol=1e-14, rtol=0.0):
-        return 1.0
+    nbar = np.asarray(nbar, dtype=np.float64)
     beta = -(nbar / (l * (1 + nbar)))
     pref = factorial(l) / beta
-    p1 = pref * l / poch(1 / beta, l + 2)
-    p2 = pref * beta / poch(2 + 1 / beta, l)
-    return (p1 + p2) * (-1) ** l
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p1 = pref * l / poch(1 / beta, l + 2)
+        p2 = pref * beta / poch(2 + 1 / beta, l)
+        tor_val = (p1 + p2) * (-1) ** l
+    return np.where(np.isclose(l, nbar, atol=1e-14, rtol=0.0), 1.0, tor_val)
+
+
+NBARS = np.arange(0.25, 3, 0.25)
+
+
+@lru_cache()
+def torontonian_analytical_nbars(l):
+    r"""Return the values of the Torontonian of the O matrices generated by gen_omats
+    for every mean photon number in ``NBARS``
+
+    Args:
+        l (int): number of modes
+
+    Returns:
+        array: Values of the torontonian of gen_omats(l,nbar) for nbar in NBARS
+    """
+    return torontonian_analytical(l, NBARS)
 
 
 def test_torontonian_tmsv():
@@ -108,10 +137,20 @@ def test_torontonian_vacuum():
 
 
 @pytest.mark.parametrize("l", [1, 2, 3, 4, 5])
-@pytest.mark.parametrize("nbar", np.arange(0.25, 3, 0.25))
-def test_torontonian_analytical_mats(l, nbar):
+@pytest.mark.parametrize("i, nbar", list(enumerate(NBARS)))
+def test_torontonian_analytical_mats(l, i, nbar):
     """Checks the correct value of the torontonian for the analytical family described by gen_omats"""
-    assert np.allclose(torontonian_analytical(l, nbar), tor(gen_omats(l, nbar)))
+    assert np.allclose(torontonian_analytical_nbars(l)[i], tor(gen_omats(l, nbar)))
+
+
+@pytest.mark.parametrize("l", [10, 12])
+@pytest.mark.parametrize("nbar", [0.01, 0.25, 1.5])
+def test_torontonian_analytical_mats_large(l, nbar):
+    """Checks the torontonian of large matrices of the analytical family described by gen_omats,
+    whose values are small and result from the cancellation of many terms of alternating sign"""
+    assert np.allclose(tor(gen_omats(l, nbar)), torontonian_analytical(l, nbar), rtol=1e-4, atol=1e-16)
+
+
 @pytest.mark.parametrize("r", [0.5, 0.5, -0.8, 1, 0])
 @pytest.mark.parametrize("alpha", [0.5, 2, -0.5, 0.0, -0.5])
 def test_disp_torontonian(r, alpha):
@@ -130,9 +169,7 @@ def test_disp_torontonian(r, alpha):
     cov = two_mode_squeezing(abs(2 * r), np.angle(2 * r))
     mu = 2 * np.array([alpha.real, alpha.real, alpha.imag, alpha.imag])
 
-    p00n = threshold_detection_prob_displacement(mu, cov, np.array([0, 0]))
-    p01n = threshold_detection_prob_displacement(mu, cov, np.array([0, 1]))
-    p11n = threshold_detection_prob_displacement(mu, cov, np.array([1, 1]))
+    p00n, p01n, p11n = threshold_detection_probs(mu, cov, np.array([[0, 0], [0, 1], [1, 1]]))
 
     assert np.isclose(p00a, p00n)
     assert np.isclose(p01a, p01n)
@@ -189,6 +226,18 @@ def test_tor_and_threshold_prob_agree(n_modes):
     prob = threshold_detection_prob(mu, cv, [1] * n_modes)
     assert np.allclose(expected, prob)
 
+@pytest.mark.parametrize("scale", [0, 1])
+@pytest.mark.parametrize("n_modes", [1, 2, 3])
+def test_threshold_detection_probs(scale, n_modes):
+    """Tests that the batched threshold detection probabilities agree with
+    threshold_detection_prob for every detection pattern"""
+    cv = random_covariance(n_modes)
+    mu = scale * (2 * np.random.rand(2 * n_modes) - 1)
+    patterns = np.array(list(itertools.product([0, 1], repeat=n_modes)))
+    probs = threshold_detection_probs(mu, cv, patterns)
+    expected = [threshold_detection_prob(mu, cv, pattern) for pattern in patterns]
+    assert np.allclose(probs, expected)
+
 @pytest.mark.parametrize("N", range(1, 10))
 def test_numba_tor(N):
     """Tests numba implementation of the torontonian against the default implementation"""
@@ -197,3 +246,18 @@ def test_numba_tor(N):
     t1 = tor(O)
     t2 = numba_tor(O)
     assert np.isclose(t1, t2)
+
+
+@pytest.mark.parametrize("l", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("nbar", [0.25, 1.0, 2.75])
+def test_numba_tor_analytical_mats(l, nbar):
+    """Checks the numba torontonian against the analytical family described by gen_omats"""
+    assert np.allclose(torontonian_analytical(l, nbar), numba_tor(gen_omats(l, nbar)))
+
+
+@pytest.mark.parametrize("N", range(1, 5))
+def test_numba_tor_non_hermitian(N):
+    """Tests the numba torontonian of a non-Hermitian matrix, for which the
+    determinants cannot be obtained from a Cholesky decomposition"""
+    O = 0.1 * np.random.rand(2 * N, 2 * N)
+    assert np.isclose(tor(O), numba_tor(O))